@@ -2,16 +2,11 @@
 """Create placeholder silent WAV files for testing"""
 
 import os
+import struct
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-try:
-    from pydub import AudioSegment
-    from pydub.generators import Sine
-except ImportError:
-    print("Error: pydub not found. Install with: pip install pydub", file=sys.stderr)
-    sys.exit(1)
-
 # Track files needed
 JUNGLE_TRACKS = [
     'jungle-ambient.wav',
@@ -26,25 +21,36 @@ GROOVY_TRACKS = [
     'groovy-lead.wav'
 ]
 
-def create_silent_wav(duration_seconds=60, sample_rate=44100, channels=2):
-    """Create a silent WAV file"""
-    # Create silent audio segment
-    silence = AudioSegment.silent(duration=duration_seconds * 1000)  # pydub uses milliseconds
-    return silence
+def wav_header(num_frames, sample_rate=44100, channels=2, sample_width=2):
+    """Build a 44-byte RIFF/WAVE header for 16-bit PCM data"""
+    data_size = num_frames * channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', data_size + 36, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b'data', data_size
+    )
+
+def create_silent_wav(output_path, duration_seconds=60, sample_rate=44100, channels=2):
+    """Write a silent WAV file (header + zeroed PCM data)
+    
+    Only the 44-byte header is written; the file is then extended to its
+    full length with ftruncate, which reads back as zeros. On filesystems
+    that support it the sample data is sparse and takes no disk space.
+    """
+    header = wav_header(duration_seconds * sample_rate, sample_rate, channels)
+    data_size = duration_seconds * sample_rate * channels * 2
+    
+    with open(output_path, 'wb') as f:
+        f.write(header)
+        os.ftruncate(f.fileno(), len(header) + data_size)
 
 def create_placeholder_track(output_path, duration=60):
-    """Create a placeholder track (silent or very quiet tone)"""
+    """Create a placeholder track (silent)"""
     try:
-        # Option 1: Completely silent
-        audio = create_silent_wav(duration_seconds=duration)
-        
-        # Option 2: Very quiet tone (almost silent) - uncomment to use
-        # tone = Sine(20).to_audio_segment(duration=duration * 1000)
-        # tone = tone - 60  # Very quiet (-60dB)
-        # audio = tone
-        
-        # Export as WAV (44.1kHz, 16-bit, stereo)
-        audio.export(output_path, format="wav", parameters=["-ar", "44100", "-ac", "2"])
+        # Write WAV directly (44.1kHz, 16-bit, stereo) - no ffmpeg needed
+        create_silent_wav(output_path, duration_seconds=duration)
         return True
     except Exception as e:
         print(f"Error creating {output_path}: {e}", file=sys.stderr)
@@ -65,6 +71,7 @@ def main():
     created = 0
     skipped = 0
     
+    pending = []
     for track_name in all_tracks:
         output_path = public_dir / track_name
         
@@ -73,12 +80,23 @@ def main():
             skipped += 1
             continue
         
-        if create_placeholder_track(output_path, duration=60):
-            file_size = output_path.stat().st_size / (1024 * 1024)  # MB
-            print(f"  OK:   {track_name} ({file_size:.2f} MB)")
-            created += 1
-        else:
-            print(f"  FAIL: {track_name}")
+        pending.append(output_path)
+    
+    # Tracks are independent files, so write them concurrently
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            futures = {
+                executor.submit(create_placeholder_track, output_path, 60): output_path
+                for output_path in pending
+            }
+            for future in as_completed(futures):
+                output_path = futures[future]
+                if future.result():
+                    file_size = output_path.stat().st_size / (1024 * 1024)  # MB
+                    print(f"  OK:   {output_path.name} ({file_size:.2f} MB)")
+                    created += 1
+                else:
+                    print(f"  FAIL: {output_path.name}")
     
     print(f"\nCreated {created} files, skipped {skipped} existing files")
     print(f"\nNote: These are silent placeholder files for testing.")
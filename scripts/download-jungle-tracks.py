@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Download rainforest sound tracks from earth.fm and convert to WAV format"""
 
+import importlib.util
 import os
 import sys
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 # Track mapping: target filename -> description/search terms
@@ -20,8 +22,20 @@ GROOVY_TRACKS = {
     'groovy-lead.wav': 'lead'
 }
 
+# Marker returned by check_ytdlp when yt-dlp can be used in-process
+YTDLP_MODULE = 'yt_dlp'
+
+@lru_cache(maxsize=None)
 def check_ytdlp():
-    """Check if yt-dlp is installed"""
+    """Check if yt-dlp is installed
+    
+    Prefers the yt_dlp Python module (located without importing it, no
+    process spawn) and only probes the yt-dlp/youtube-dl executables when
+    it isn't available. The result is cached for the life of the process.
+    """
+    if importlib.util.find_spec('yt_dlp') is not None:
+        return YTDLP_MODULE
+    
     try:
         result = subprocess.run(['yt-dlp', '--version'], 
                               capture_output=True, text=True, timeout=5)
@@ -40,39 +54,63 @@ def check_ytdlp():
     
     return None
 
+def download_in_process(url, output_path):
+    """Download audio from URL and convert to WAV using the yt_dlp module"""
+    from yt_dlp import YoutubeDL
+    
+    options = {
+        'format': 'bestaudio/best',
+        'outtmpl': str(output_path),
+        'noplaylist': True,  # Single file only
+        'quiet': True,  # Less verbose output
+        'concurrent_fragment_downloads': 4,  # Fetch fragmented streams in parallel
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'wav',
+            'preferredquality': '0',  # Best quality
+        }],
+    }
+    with YoutubeDL(options) as ydl:
+        ydl.download([url])
+
 def download_from_url(url, output_path, tool='yt-dlp'):
     """Download audio from URL and convert to WAV"""
     try:
         print(f"Downloading from {url}...")
         
-        # Use yt-dlp/youtube-dl to extract and download
-        # Extract best audio quality and convert to WAV
-        cmd = [
-            tool,
-            url,
-            '--extract-audio',
-            '--audio-format', 'wav',
-            '--audio-quality', '0',  # Best quality
-            '--output', str(output_path),
-            '--no-playlist',  # Single file only
-            '--quiet',  # Less verbose output
-        ]
+        if tool == YTDLP_MODULE:
+            download_in_process(url, output_path)
+        else:
+            # Use yt-dlp/youtube-dl to extract and download
+            # Extract best audio quality and convert to WAV
+            cmd = [
+                tool,
+                url,
+                '--extract-audio',
+                '--audio-format', 'wav',
+                '--audio-quality', '0',  # Best quality
+                '--output', str(output_path),
+                '--no-playlist',  # Single file only
+                '--quiet',  # Less verbose output
+            ]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            
+            if result.returncode != 0:
+                print(f"Error: {result.stderr}", file=sys.stderr)
+                return False
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        # yt-dlp may add extension, check if file exists
+        if output_path.exists():
+            return True
         
-        if result.returncode == 0:
-            # yt-dlp may add extension, check if file exists
-            if output_path.exists():
-                return True
-            
-            # Try with .wav extension added by yt-dlp
-            wav_path = output_path.parent / f"{output_path.stem}.wav"
-            if wav_path.exists():
-                wav_path.rename(output_path)
-                return True
-        else:
-            print(f"Error: {result.stderr}", file=sys.stderr)
-            return False
+        # Try with .wav extension added by yt-dlp
+        wav_path = output_path.parent / f"{output_path.stem}.wav"
+        if wav_path.exists():
+            wav_path.rename(output_path)
+            return True
+        
+        return False
             
     except subprocess.TimeoutExpired:
         print(f"Timeout downloading {url}", file=sys.stderr)
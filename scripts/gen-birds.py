@@ -1,42 +1,106 @@
 #!/usr/bin/env python3
 """Generate bird sounds as WAV file using audio synthesis"""
 
-from pydub import AudioSegment
-from pydub.generators import Sine, Square, Triangle
-from pydub.effects import normalize
+import numpy as np
 import os
 import sys
-import math
 import random
+import wave
+from functools import lru_cache
 
 # Bird sound parameters
 SAMPLE_RATE = 44100
 DURATION = 300  # 5 minutes of bird sounds
 BIT_DEPTH = 16
+AMPLITUDE = 0.5  # Per-tone peak level before final normalization
+HEADROOM_DB = 1.0  # Normalize peaks to -1 dBFS
 
-def generate_chirp_freq(frequency, duration_ms, sample_rate=SAMPLE_RATE):
-    """Generate a simple chirp using frequency modulation (no numpy)"""
+# One period of a sine wave; tones are synthesized by indexing into it
+TABLE_SIZE = 16384  # Power of two so the phase wraps with a bit mask
+SINE_TABLE = np.sin(2 * np.pi * np.arange(TABLE_SIZE) / TABLE_SIZE).astype(np.float32)
+
+def ms_to_samples(duration_ms, sample_rate=SAMPLE_RATE):
+    """Convert a duration in milliseconds to a whole number of samples"""
+    return int(duration_ms * sample_rate / 1000)
+
+def generate_tone(frequency, num_samples, sample_rate=SAMPLE_RATE):
+    """Synthesize a sine tone as float samples in [-1, 1] from the wavetable"""
+    # Table position advances by a fixed step per sample; wrap with a mask
+    phase = np.arange(num_samples, dtype=np.float64)
+    phase *= frequency * TABLE_SIZE / sample_rate
+    index = phase.astype(np.int64)
+    index &= TABLE_SIZE - 1
+    return SINE_TABLE[index]
+
+def generate_sweep(frequencies, sample_rate=SAMPLE_RATE):
+    """Synthesize a tone following a per-sample frequency curve
+    
+    The table position is the running sum of the per-sample phase steps, so
+    phase stays continuous however fast the frequency moves.
+    """
+    phase = np.cumsum(frequencies * (TABLE_SIZE / sample_rate))
+    index = phase.astype(np.int64)
+    index &= TABLE_SIZE - 1
+    return SINE_TABLE[index]
+
+@lru_cache(maxsize=512)
+def fade_ramp(num_samples):
+    """Return a cached, read-only linear 0 -> 1 ramp of num_samples"""
+    ramp = np.linspace(0.0, 1.0, num_samples, dtype=np.float32)
+    ramp.flags.writeable = False
+    return ramp
+
+def apply_fade(samples, fade_in_ms, fade_out_ms, sample_rate=SAMPLE_RATE):
+    """Apply linear fade in/out ramps to float samples (in place)"""
+    fade_in = min(ms_to_samples(fade_in_ms, sample_rate), len(samples))
+    fade_out = min(ms_to_samples(fade_out_ms, sample_rate), len(samples))
+    if fade_in:
+        samples[:fade_in] *= fade_ramp(fade_in)
+    if fade_out:
+        samples[-fade_out:] *= fade_ramp(fade_out)[::-1]
+    return samples
+
+def to_pcm16(samples, amplitude=AMPLITUDE):
+    """Scale float samples in [-1, 1] to 16-bit PCM (scales in place)"""
+    samples *= amplitude * 32767
+    return samples.astype(np.int16)
+
+def mix_into(out, start, samples):
+    """Add 16-bit samples into out at start (trimmed to the buffer end)
+    
+    Returns:
+        Number of samples the sound spans, including any trimmed tail
+    """
+    end = min(start + len(samples), len(out))
+    if end > start:
+        out[start:end] += samples[:end - start]
+    return len(samples)
+
+def generate_chirp_freq(out, start, frequency, duration_ms, sample_rate=SAMPLE_RATE):
+    """Render a simple chirp using frequency modulation into out at start"""
+    num_samples = ms_to_samples(duration_ms, sample_rate)
+    
     # Create base tone
-    base_tone = Sine(frequency).to_audio_segment(duration=duration_ms)
+    chirp = generate_tone(frequency, num_samples, sample_rate)
     
     # Add slight variation with a modulated tone
     mod_freq = frequency * (1 + random.uniform(-0.15, 0.15))
-    mod_tone = Sine(mod_freq).to_audio_segment(duration=duration_ms)
+    chirp += generate_tone(mod_freq, num_samples, sample_rate)
     
-    # Mix tones for richness
-    chirp = base_tone.overlay(mod_tone, gain_during_overlay=-6)  # Mix at -6dB
+    # Mix tones for richness (each at -6dB)
+    chirp *= 0.5
     
     # Apply amplitude envelope (fade in/out)
     fade_in = min(20, duration_ms // 10)  # 20ms or 10% fade in
     fade_out = min(50, duration_ms // 5)  # 50ms or 20% fade out
-    chirp = chirp.fade_in(fade_in).fade_out(fade_out)
+    apply_fade(chirp, fade_in, fade_out, sample_rate)
     
-    return chirp
+    return mix_into(out, start, to_pcm16(chirp))
 
-def generate_bird_call(frequency_range=(800, 4000), duration_ms_range=(50, 300)):
-    """Generate a complete bird call (multiple chirps)"""
+def generate_bird_call(out, start, frequency_range=(800, 4000), duration_ms_range=(50, 300)):
+    """Render a complete bird call (multiple chirps) into out at start"""
     num_chirps = random.randint(2, 6)  # 2-6 chirps per call
-    call_chirps = []
+    cursor = start
     
     for i in range(num_chirps):
         # Frequency varies between chirps (melodic pattern)
@@ -47,114 +111,95 @@ def generate_bird_call(frequency_range=(800, 4000), duration_ms_range=(50, 300))
         chirp_duration = random.uniform(*duration_ms_range)
         
         # Generate chirp
-        chirp = generate_chirp_freq(freq, int(chirp_duration))
-        call_chirps.append(chirp)
+        cursor += generate_chirp_freq(out, cursor, freq, int(chirp_duration))
         
-        # Silence between chirps (except last one)
+        # Silence between chirps (except last one); the buffer is already
+        # zeroed, so silence is just a cursor advance
         if i < num_chirps - 1:
             silence_duration = random.uniform(30, 150)  # 30-150ms silence
-            silence = AudioSegment.silent(duration=int(silence_duration))
-            call_chirps.append(silence)
+            cursor += ms_to_samples(silence_duration)
     
-    # Concatenate all chirps
-    call = sum(call_chirps)  # pydub's sum concatenates AudioSegments
-    return call
+    return cursor - start
 
-def generate_descending_whistle(frequency_range=(1500, 3500), duration_ms=300):
-    """Generate a descending whistle call"""
+def generate_descending_whistle(out, start, frequency_range=(1500, 3500), duration_ms_range=(200, 400)):
+    """Render a descending whistle call into out at start"""
+    duration_ms = random.uniform(*duration_ms_range)
     start_freq = random.uniform(*frequency_range)
     end_freq = start_freq * random.uniform(0.5, 0.8)  # Descend 20-50%
     
-    # Create multiple segments for smooth frequency transition
-    segments = []
-    num_segments = 10
-    for i in range(num_segments):
-        t = i / num_segments
-        freq = start_freq + (end_freq - start_freq) * t
-        segment_duration = duration_ms / num_segments
-        segment = Sine(freq).to_audio_segment(duration=int(segment_duration))
-        segments.append(segment)
-    
-    whistle = sum(segments)
-    whistle = whistle.fade_in(20).fade_out(50)
-    return whistle
-
-def generate_warbling_trill(frequency_base=2000, duration_ms=400):
-    """Generate a warbling trill (rapid frequency modulation)"""
-    segments = []
-    num_segments = 20  # Many small segments for warbling effect
-    
-    for i in range(num_segments):
-        # Vary frequency around base
-        variation = math.sin(i * 2 * math.pi / num_segments) * 0.2  # ±20% variation
-        freq = frequency_base * (1 + variation)
-        segment_duration = duration_ms / num_segments
-        segment = Sine(freq).to_audio_segment(duration=int(segment_duration))
-        segments.append(segment)
-    
-    trill = sum(segments)
-    trill = trill.fade_in(10).fade_out(30)
-    return trill
+    # Glide linearly from start to end frequency with continuous phase
+    frequencies = np.linspace(start_freq, end_freq, ms_to_samples(duration_ms))
+    whistle = generate_sweep(frequencies)
+    
+    apply_fade(whistle, 20, 50)
+    return mix_into(out, start, to_pcm16(whistle))
+
+def generate_warbling_trill(out, start, frequency_range=(1800, 2800), duration_ms_range=(300, 600)):
+    """Render a warbling trill (rapid frequency modulation) into out at start"""
+    frequency_base = random.uniform(*frequency_range)
+    duration_ms = random.uniform(*duration_ms_range)
+    
+    # Vary frequency around base, one ±20% cycle over the trill
+    num_samples = ms_to_samples(duration_ms)
+    cycle = np.arange(num_samples) * (2 * np.pi / max(num_samples, 1))
+    frequencies = frequency_base * (1 + 0.2 * np.sin(cycle))
+    trill = generate_sweep(frequencies)
+    
+    apply_fade(trill, 10, 30)
+    return mix_into(out, start, to_pcm16(trill))
+
+# Different bird types: (renderer, frequency range, call duration range)
+BIRD_PATTERNS = [
+    (generate_bird_call, (1200, 3500), (50, 250)),  # High songbird
+    (generate_bird_call, (800, 2500), (80, 400)),  # Medium songbird
+    (generate_bird_call, (600, 1800), (100, 500)),  # Lower songbird
+    (generate_descending_whistle, (1500, 3500), (200, 400)),  # Whistle
+    (generate_warbling_trill, (1800, 2800), (300, 600)),  # Trill
+]
+
+PATTERN_WEIGHTS = [3, 3, 2, 2, 1]  # Weighted random selection
+
+def normalize(samples, headroom_db=HEADROOM_DB):
+    """Scale 16-bit samples so the peak sits headroom_db below full scale"""
+    peak = np.abs(samples.astype(np.int32)).max()
+    if peak == 0:
+        return samples
+    gain = 32767 * 10 ** (-headroom_db / 20) / peak
+    return np.clip(np.rint(samples * gain), -32768, 32767).astype(np.int16)
 
 def generate_bird_sounds(duration_seconds=300, sample_rate=SAMPLE_RATE):
-    """Generate continuous bird sounds for specified duration"""
-    audio_segments = []
-    current_duration_ms = 0
-    target_duration_ms = duration_seconds * 1000
-    
-    # Different bird types (frequency ranges and call patterns)
-    bird_patterns = [
-        ('high_songbird', (1200, 3500), (50, 250)),
-        ('medium_songbird', (800, 2500), (80, 400)),
-        ('lower_songbird', (600, 1800), (100, 500)),
-        ('whistle', (1500, 3500), (200, 400)),
-        ('trill', (1800, 2800), (300, 600)),
-    ]
-    
-    pattern_weights = [3, 3, 2, 2, 1]  # Weighted random selection
-    
-    while current_duration_ms < target_duration_ms:
-        # Choose bird pattern (weighted random)
-        pattern_idx = random.choices(range(len(bird_patterns)), weights=pattern_weights)[0]
-        pattern_name, freq_range, duration_range = bird_patterns[pattern_idx]
-        
-        # Generate call based on pattern
-        if pattern_name == 'whistle':
-            call = generate_descending_whistle(freq_range, random.uniform(*duration_range))
-        elif pattern_name == 'trill':
-            call = generate_warbling_trill(random.uniform(*freq_range), random.uniform(*duration_range))
-        else:
-            call = generate_bird_call(freq_range, duration_range)
-        
-        audio_segments.append(call)
-        current_duration_ms += len(call)
-        
-        # Variable silence between calls (natural timing)
-        silence_duration = random.uniform(500, 3000)  # 0.5-3 seconds
-        silence = AudioSegment.silent(duration=int(silence_duration))
-        audio_segments.append(silence)
-        current_duration_ms += silence_duration
-        
-        # Occasional longer pause (natural behavior)
-        if random.random() < 0.1:  # 10% chance
-            long_pause = random.uniform(2000, 5000)  # 2-5 seconds
-            silence = AudioSegment.silent(duration=int(long_pause))
-            audio_segments.append(silence)
-            current_duration_ms += long_pause
+    """Generate continuous bird sounds for specified duration
+    
+    Calls are rendered straight into a preallocated 16-bit buffer at their
+    sample offsets and silences only advance the cursor, so the cost stays
+    linear in the output length.
+    """
+    target_samples = duration_seconds * sample_rate
+    samples = np.zeros(target_samples, dtype=np.int16)
+    cursor = 0
     
-    # Concatenate all segments
-    print("Combining audio segments...")
-    full_audio = sum(audio_segments)
+    # Draw every per-call choice up front. Each call is followed by at least
+    # 500ms of silence, which bounds how many calls can fit in the duration.
+    rng = np.random.default_rng()
+    max_calls = target_samples // ms_to_samples(500, sample_rate) + 1
+    pattern_probs = np.array(PATTERN_WEIGHTS) / sum(PATTERN_WEIGHTS)
+    pattern_ids = rng.choice(len(BIRD_PATTERNS), size=max_calls, p=pattern_probs)
     
-    # Trim to exact duration
-    target_samples = target_duration_ms
-    if len(full_audio) > target_samples:
-        full_audio = full_audio[:target_samples]
+    # Variable silence between calls (natural timing), 0.5-3 seconds, plus an
+    # occasional longer 2-5 second pause (natural behavior, 10% chance)
+    gaps_ms = rng.uniform(500, 3000, size=max_calls)
+    gaps_ms += np.where(rng.random(max_calls) < 0.1, rng.uniform(2000, 5000, size=max_calls), 0.0)
+    gap_samples = (gaps_ms * sample_rate / 1000).astype(np.int64)
     
-    # Normalize to prevent clipping (pydub's normalize)
-    full_audio = normalize(full_audio, headroom=1.0)  # 1dB headroom
+    for pattern_idx, gap in zip(pattern_ids.tolist(), gap_samples.tolist()):
+        if cursor >= target_samples:
+            break
+        # Render call based on pattern at the cursor (trimmed to the exact duration)
+        render, freq_range, duration_range = BIRD_PATTERNS[pattern_idx]
+        cursor += render(samples, cursor, freq_range, duration_range) + gap
     
-    return full_audio
+    # Normalize to prevent clipping
+    return normalize(samples)
 
 def generate_bird_sounds_file(output_path=None, duration_seconds=300):
     """Generate bird sounds and save as WAV file"""
@@ -163,7 +208,7 @@ def generate_bird_sounds_file(output_path=None, duration_seconds=300):
         print("This may take a moment...")
         
         # Generate audio
-        audio_segment = generate_bird_sounds(duration_seconds, SAMPLE_RATE)
+        samples = generate_bird_sounds(duration_seconds, SAMPLE_RATE)
         
         # Determine output path
         if output_path is None:
@@ -175,19 +220,19 @@ def generate_bird_sounds_file(output_path=None, duration_seconds=300):
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Export as WAV (44.1kHz, 16-bit, mono)
+        # Write WAV directly from the sample buffer (44.1kHz, 16-bit, mono)
         print("Saving to WAV file...")
-        audio_segment.export(
-            output_path,
-            format="wav",
-            parameters=["-ar", str(SAMPLE_RATE), "-ac", "1"]  # Mono
-        )
+        with wave.open(output_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(BIT_DEPTH // 8)
+            wav_file.setframerate(SAMPLE_RATE)
+            wav_file.writeframes(samples.data)
         
         print(f"Bird sounds saved to {output_path}")
         
         # Get file info
         file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
-        duration_actual = len(audio_segment) / 1000.0
+        duration_actual = len(samples) / SAMPLE_RATE
         print(f"File size: {file_size_mb:.2f} MB")
         print(f"Duration: {duration_actual:.1f} seconds")
         print(f"Sample rate: {SAMPLE_RATE} Hz, {BIT_DEPTH}-bit, mono")
@@ -6,26 +6,74 @@ import sys
 import argparse
 from pathlib import Path
 
-try:
-    from audiocraft.models import MusicGen
-    import torch
-except ImportError as e:
-    print(f"Error: Missing required dependency. Please install audiocraft:")
-    print(f"  pip install audiocraft")
-    sys.exit(1)
+def get_output_paths(output_path, count):
+    """Derive one output path per prompt from the --output path
+    
+    A single prompt writes to output_path unchanged; multiple prompts get a
+    numbered suffix, e.g. generated-music-1.wav, generated-music-2.wav.
+    """
+    output_path = Path(output_path)
+    if count == 1:
+        return [output_path]
+    return [
+        output_path.with_name(f"{output_path.stem}-{i}{output_path.suffix}")
+        for i in range(1, count + 1)
+    ]
+
+def save_wav(audio_int16, sample_rate, output_path, duration):
+    """Save an int16 (samples, channels) audio array as a 16-bit WAV file
+    
+    Prefers soundfile (libsndfile), writing in one-second blocks so the file
+    is streamed to disk rather than serialized in one shot; falls back to
+    scipy when soundfile isn't installed.
+    """
+    try:
+        import soundfile as sf
+        with sf.SoundFile(output_path, 'w', samplerate=sample_rate,
+                          channels=audio_int16.shape[1], subtype='PCM_16') as f:
+            for start in range(0, len(audio_int16), sample_rate):
+                f.write(audio_int16[start:start + sample_rate])
+    except ImportError:
+        try:
+            import scipy.io.wavfile as wavfile
+            wavfile.write(output_path, sample_rate, audio_int16)
+        except ImportError:
+            print("Error: Need either soundfile or scipy to save WAV file")
+            print("  pip install soundfile")
+            print("  or")
+            print("  pip install scipy")
+            sys.exit(1)
+    
+    print(f"Successfully saved music to: {output_path}")
+    print(f"  Duration: {duration}s")
+    print(f"  Sample rate: {sample_rate}Hz")
 
-def generate_music(prompt, output_path, duration=30, model_size='facebook/musicgen-medium'):
-    """Generate music using MusicGen model and save as WAV file
+def generate_music(prompts, output_path, duration=30, model_size='facebook/musicgen-medium'):
+    """Generate music using MusicGen model and save as WAV file(s)
+    
+    All prompts are generated together in a single batched call, so the
+    model is loaded and run once regardless of how many tracks are requested.
     
     Args:
-        prompt: Text description of the music to generate
-        output_path: Path to save the output WAV file
+        prompts: List of text descriptions of the music to generate
+        output_path: Path to save the output WAV file (numbered per prompt
+            when more than one prompt is given)
         duration: Duration of the generated music in seconds (default: 30)
         model_size: Model to use (default: 'facebook/musicgen-medium')
     """
-    print(f"Loading MusicGen model: {model_size}")
+    # Imported here so --help and argument errors don't pay for torch
+    try:
+        from audiocraft.models import MusicGen
+        import torch
+    except ImportError as e:
+        print(f"Error: Missing required dependency. Please install audiocraft:")
+        print(f"  pip install audiocraft")
+        sys.exit(1)
+    
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    print(f"Loading MusicGen model: {model_size} ({device})")
     try:
-        model = MusicGen.get_pretrained(model_size)
+        model = MusicGen.get_pretrained(model_size, device=device)
     except Exception as e:
         print(f"Error loading model: {e}")
         print("Make sure you have internet connection for first-time model download")
@@ -34,53 +82,37 @@ def generate_music(prompt, output_path, duration=30, model_size='facebook/musicg
     print(f"Setting generation parameters: duration={duration}s")
     model.set_generation_params(duration=duration)
     
-    print(f"Generating music with prompt: '{prompt}'")
+    for prompt in prompts:
+        print(f"Generating music with prompt: '{prompt}'")
     try:
-        wav = model.generate([prompt])
+        # No autograd bookkeeping needed for generation
+        with torch.inference_mode():
+            wavs = model.generate(prompts)
     except Exception as e:
         print(f"Error generating music: {e}")
         sys.exit(1)
     
-    # Convert tensor to numpy array and save
-    audio_array = wav[0].cpu().numpy()
     sample_rate = model.sample_rate
-    
-    # Save as WAV file using scipy or soundfile
-    try:
-        import scipy.io.wavfile as wavfile
-        # Convert from float32 [-1, 1] to int16 [-32768, 32767]
-        audio_int16 = (audio_array * 32767).astype('int16')
-        wavfile.write(output_path, sample_rate, audio_int16)
-        print(f"Successfully saved music to: {output_path}")
-        print(f"  Duration: {duration}s")
-        print(f"  Sample rate: {sample_rate}Hz")
-    except ImportError:
-        try:
-            import soundfile as sf
-            sf.write(output_path, audio_array, sample_rate)
-            print(f"Successfully saved music to: {output_path}")
-            print(f"  Duration: {duration}s")
-            print(f"  Sample rate: {sample_rate}Hz")
-        except ImportError:
-            print("Error: Need either scipy or soundfile to save WAV file")
-            print("  pip install scipy")
-            print("  or")
-            print("  pip install soundfile")
-            sys.exit(1)
+    for wav, path in zip(wavs, get_output_paths(output_path, len(prompts))):
+        # Convert from float32 [-1, 1] to int16 on the device before copying
+        # to host (half the transfer), laid out as (samples, channels)
+        audio_int16 = wav.clamp(-1, 1).mul_(32767).to(torch.int16).T.cpu().numpy()
+        save_wav(audio_int16, sample_rate, str(path), duration)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate music using AudioCraft MusicGen')
     parser.add_argument(
         '--prompt',
         type=str,
-        default='dark minimal techno, 130bpm, rolling bassline',
-        help='Text description of the music to generate (default: "dark minimal techno, 130bpm, rolling bassline")'
+        nargs='+',
+        default=['dark minimal techno, 130bpm, rolling bassline'],
+        help='Text description(s) of the music to generate; several prompts are generated in one batch (default: "dark minimal techno, 130bpm, rolling bassline")'
     )
     parser.add_argument(
         '--output',
         type=str,
         default='public/generated-music.wav',
-        help='Output WAV file path (default: public/generated-music.wav)'
+        help='Output WAV file path, numbered per prompt when several are given (default: public/generated-music.wav)'
     )
     parser.add_argument(
         '--duration',
@@ -103,7 +135,7 @@ def main():
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     generate_music(
-        prompt=args.prompt,
+        prompts=args.prompt,
         output_path=str(output_path),
         duration=args.duration,
         model_size=args.model
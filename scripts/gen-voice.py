@@ -1,71 +1,96 @@
 #!/usr/bin/env python3
 """Generate Fire Horse speech as WAV file using Google TTS"""
 
-from gtts import gTTS
-from pydub import AudioSegment
+import base64
+import hashlib
+import importlib.util
 import io
 import os
+import re
+import shutil
+import subprocess
 import sys
-try:
+import threading
+import urllib.request
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+# Optional backends, located without importing them; each module is only
+# imported by the function that uses it, keeping CLI startup fast
+SOUNDDEVICE_AVAILABLE = importlib.util.find_spec("sounddevice") is not None
+PYAV_AVAILABLE = importlib.util.find_spec("av") is not None
+
+# Synthesized audio is cached here, keyed by a hash of the script and TTS options
+CACHE_DIR = Path.home() / ".cache" / "fire-horse"
+
+# Per-sentence MP3 fragments, so editing one sentence only resynthesizes that one
+FRAGMENT_CACHE_DIR = CACHE_DIR / "frags"
+
+# Sentences are synthesized as concurrent Google TTS requests
+TTS_WORKERS = 8
+
+# Google TTS voice; UK English for a warmer tone
+TTS_LANG = 'en'
+TTS_TLD = 'co.uk'
+TTS_SLOW = False
+
+# Serializes creation of the shared Google TTS session (see tts_session)
+TTS_SESSION_LOCK = threading.Lock()
+
+# Base64 MP3 payload in a Google TTS batchexecute response line
+TTS_AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# Output WAV format (16-bit PCM, mono); Google TTS audio is 24 kHz mono, so
+# a higher rate only doubles the file size
+SAMPLE_RATE = 22050
+
+# libopus only encodes at 8/12/16/24/48 kHz; 24 kHz is Google TTS's own rate
+OPUS_SAMPLE_RATE = 24000
+
+# Encoders for the converted output formats: PyAV container, codec and
+# options, and the equivalent ffmpeg output arguments
+ENCODERS = {
+    'wav': {
+        'container': 'wav', 'codec': 'pcm_s16le', 'bit_rate': None, 'options': {},
+        'ffmpeg_args': ["-c:a", "pcm_s16le", "-f", "wav"],
+    },
+    'opus': {
+        'container': 'ogg', 'codec': 'libopus', 'bit_rate': 32000,
+        'options': {'application': 'voip'},
+        'ffmpeg_args': ["-c:a", "libopus", "-b:a", "32k", "-application", "voip", "-f", "ogg"],
+    },
+}
+
+# One entry of the --list-mics output
+MICROPHONE_TEMPLATE = (
+    "Device {index}: {name}{default_marker}\n"
+    "  Channels: {channels}\n"
+    "  Sample Rate: {sample_rate:.0f} Hz\n"
+    "  Host API: {hostapi}\n"
+    "\n"
+)
+
+# The Fire Horse script with micro-jokes, read only when speech is generated
+SCRIPT_PATH = Path(__file__).parent / "fire-horse-script.txt"
+
+@lru_cache(maxsize=1)
+def query_all_devices():
+    """Return the PortAudio device list, enumerated once per process
+    
+    Device enumeration probes every host API backend, so repeat callers
+    share this result; call query_all_devices.cache_clear() after
+    re-initializing PortAudio to pick up hotplugged devices.
+    """
     import sounddevice as sd
-    SOUNDDEVICE_AVAILABLE = True
-except ImportError:
-    SOUNDDEVICE_AVAILABLE = False
-
-# The Fire Horse script with micro-jokes
-script = """Friends, fellow travelers, and anyone who accidentally clicked this link.
-
-Tonight we call in the Fire Horse. Not as some dusty myth, but as a force of becoming. Also, arguably, the best excuse for a party in sixty years.
-
-The Fire Horse is movement and ignition. It's that moment when Netflix asks if you're still watching and you say no, actually, I'm going outside. It is courage without permission. Life refusing to shrink. Spreadsheets refusing to define us.
-
-In every culture, the horse has been a bridge: between human and wild, between earth and horizon, between instinct and that thing your therapist keeps asking about.
-
-And fire? Fire is transformation. It clears what is stagnant. It tempers what is raw. It also makes excellent s'mores, but that's beside the point.
-
-Together, Fire and Horse are not chaos. They are momentum with purpose. Think less "everything is on fire" and more "controlled burn with good vibes."
-
-We stand at the edge of an era that has exhausted itself. An era of separation: humans from nature, economies from ecology, work emails from any sense of meaning whatsoever.
-
-The Fire Horse does not ask politely for change. It arrives when systems can no longer pretend they are alive. When algorithms recommend you videos of algorithms. When your smart fridge judges your midnight cheese habits.
-
-This is not an ending. This is a reboot. The good kind, not the Hollywood kind.
-
-A remembering.
-
-The Fire Horse teaches us that humanity was never meant to dominate nature, nor disappear into it, but to dance with it. Awkwardly at first, sure. Everyone's awkward at first.
-
-To become keystone species again. Caretakers with creativity. Engineers with reverence. People who compost and won't shut up about it, but in a charming way.
-
-Playfulness returns here. Because regeneration is not grim labor. It is joyful participation in life's intelligence. If you're not occasionally laughing, you might be doing it wrong.
-
-Soil rebuilding itself. Water finding new paths. Communities re-learning how to trust, or at least how to share tools without being weird about it.
-
-Laughter is not a distraction from the work. It is proof the work is aligned. The mycelium network definitely has inside jokes. We just can't hear them yet.
-
-And yes, we carry tools now our ancestors could not imagine. They also couldn't imagine TikTok, so let's use discernment.
-
-Technology is not the enemy of nature. Extraction is. When technology serves life, it becomes a liberation tool. When it serves engagement metrics, it becomes a problem.
-
-Sensors that listen to forests. Networks that coordinate stewardship. Systems that reward regeneration instead of quarterly growth. Revolutionary stuff. Also: common sense, if you think about it.
+    return list(sd.query_devices())
 
-The Fire Horse does not reject technology. It tames it, rides it, occasionally checks its screen time and sighs deeply.
-
-This is a call to boldness. Not recklessness. Boldness. There's a difference. Look it up. Actually, you probably shouldn't look it up right now. Stay present.
-
-To live faster where life needs speed, and slower where wisdom grows. To know the difference. To stop doom-scrolling. Seriously. This is your sign.
-
-To choose courage over comfort. Regeneration over convenience. Actual community over followers.
-
-The Fire Horse runs with those who refuse to be small. Who dare to imagine civilizations that last seven generations, not seven news cycles.
-
-So let us run. Not from anything. Toward something.
-
-With the land beneath us. With the fire within us. With technology in service, not command. With snacks, probably. Revolutions need snacks.
-
-May we merge back into the living world. Not by losing ourselves, but by finally becoming fully human. Which, for the record, includes rest. And joy. And the occasional terrible pun.
-
-Welcome, Fire Horse. Run through us. Try not to knock over the furniture."""
+@lru_cache(maxsize=1)
+def query_all_hostapis():
+    """Return the PortAudio host API list, queried once per process"""
+    import sounddevice as sd
+    return list(sd.query_hostapis())
 
 def list_microphones():
     """Detect and list all available microphone devices.
@@ -78,18 +103,20 @@ def list_microphones():
         return []
     
     try:
-        devices = sd.query_devices()
+        import sounddevice as sd
+        hostapis = query_all_hostapis()
+        default_input = sd.default.device[0]
         microphones = []
         
-        for i, device in enumerate(devices):
+        for i, device in enumerate(query_all_devices()):
             if device['max_input_channels'] > 0:
                 mic_info = {
                     'index': i,
                     'name': device['name'],
                     'channels': device['max_input_channels'],
                     'sample_rate': device['default_samplerate'],
-                    'hostapi': sd.query_hostapis(device['hostapi'])['name'],
-                    'is_default': (i == sd.default.device[0])
+                    'hostapi': hostapis[device['hostapi']]['name'],
+                    'is_default': (i == default_input)
                 }
                 microphones.append(mic_info)
         
@@ -106,17 +133,16 @@ def display_microphones():
         print("No microphones detected.")
         return
     
-    print(f"\n{'='*70}")
-    print(f"Detected {len(microphones)} microphone device(s):")
-    print(f"{'='*70}\n")
-    
-    for mic in microphones:
-        default_marker = " [DEFAULT]" if mic['is_default'] else ""
-        print(f"Device {mic['index']}: {mic['name']}{default_marker}")
-        print(f"  Channels: {mic['channels']}")
-        print(f"  Sample Rate: {mic['sample_rate']:.0f} Hz")
-        print(f"  Host API: {mic['hostapi']}")
-        print()
+    rule = '=' * 70
+    sys.stdout.write(
+        f"\n{rule}\nDetected {len(microphones)} microphone device(s):\n{rule}\n\n"
+        + "".join(
+            MICROPHONE_TEMPLATE.format(
+                default_marker=" [DEFAULT]" if mic['is_default'] else "", **mic
+            )
+            for mic in microphones
+        )
+    )
     
     return microphones
 
@@ -124,7 +150,8 @@ def get_microphone_control(mic_index=None):
     """Get microphone device control information.
     
     Args:
-        mic_index: Index of microphone device. If None, returns default.
+        mic_index: Index or name substring of microphone device. If None,
+            returns the default input, or device 0 when there is none.
     
     Returns:
         Dictionary with microphone control settings
@@ -132,11 +159,23 @@ def get_microphone_control(mic_index=None):
     if not SOUNDDEVICE_AVAILABLE:
         return None
     
-    if mic_index is None:
-        mic_index = sd.default.device[0] if sd.default.device[0] is not None else 0
+    import sounddevice as sd
     
     try:
-        device = sd.query_devices(mic_index)
+        device = None
+        if mic_index is None:
+            # Ask PortAudio for just the default input, not the full device list
+            try:
+                device = sd.query_devices(kind='input')
+                mic_index = device['index']
+            except sd.PortAudioError:
+                mic_index = 0  # No default input device; fall back to device 0
+        if device is None:
+            if isinstance(mic_index, int) and 0 <= mic_index < len(query_all_devices()):
+                device = query_all_devices()[mic_index]
+            else:
+                # Let PortAudio resolve device-name substrings and reject bad indices
+                device = sd.query_devices(mic_index)
         if device['max_input_channels'] == 0:
             print(f"Device {mic_index} is not an input device.", file=sys.stderr)
             return None
@@ -152,55 +191,334 @@ def get_microphone_control(mic_index=None):
         print(f"Error getting microphone control: {e}", file=sys.stderr)
         return None
 
-def generate_speech(output_path=None):
-    """Generate speech from script and save as WAV file.
+def tts_cache_key(text, lang, tld, slow):
+    """Return the cache key (SHA-256 hex digest) for a TTS request"""
+    return hashlib.sha256(f"{lang}|{tld}|{slow}|{text}".encode()).hexdigest()
+
+def cache_tmp_path(path):
+    """Return a temp path next to a file, creating its directory
+    
+    The name is unique per process and thread, so TTS workers writing the
+    same fragment (a sentence repeated in the script) never share a temp file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def write_cache_file(path, chunks):
+    """Write byte chunks to a cache file atomically (never leaves a partial file)
+    
+    The chunks are written in turn rather than joined into one bytes object
+    first, so the data is never copied in memory.
+    """
+    tmp_path = cache_tmp_path(path)
+    with open(tmp_path, 'wb') as f:
+        f.writelines(chunks)
+    os.replace(tmp_path, path)
+
+def copy_cache_file(src_path, path):
+    """Copy a file into the cache atomically without reading it into memory"""
+    tmp_path = cache_tmp_path(path)
+    shutil.copyfile(src_path, tmp_path)
+    os.replace(tmp_path, path)
+
+def wav_duration(wav_path):
+    """Return the duration of a WAV file in seconds, read from its header"""
+    with wave.open(str(wav_path), 'rb') as w:
+        return w.getnframes() / w.getframerate()
+
+def split_sentences(text):
+    """Split text into sentences at ., ! or ? followed by whitespace"""
+    return [s for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s]
+
+@lru_cache(maxsize=1)
+def create_tts_session():
+    """Build the keep-alive HTTPS session used for Google TTS requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TTS_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
+def tts_session():
+    """Return the HTTPS session shared by all Google TTS requests
+    
+    gTTS opens a fresh session, and so a fresh TLS handshake, for every
+    request. One keep-alive session with a pool sized to the worker count
+    lets the concurrent sentence requests reuse their connections. The
+    workers all ask for it at once, and lru_cache alone would let each
+    build its own while requests is still importing, so creation is locked.
+    """
+    with TTS_SESSION_LOCK:
+        return create_tts_session()
+
+def synthesize_sentence(sentence, lang, tld, slow):
+    """Synthesize one sentence with Google TTS and return the MP3 bytes
+    
+    gTTS still tokenizes the text and builds the requests; they are sent
+    through the pooled session instead of gTTS's own per-request one. That
+    relies on gTTS's private _prepare_requests() (checked against gTTS
+    2.5); if a gTTS release drops it, gTTS's own stream() is used instead.
+    """
+    import requests
+    from gtts import gTTS
+    from gtts.tts import gTTSError
+    
+    tts = gTTS(text=sentence, lang=lang, tld=tld, slow=slow)
+    if not hasattr(tts, '_prepare_requests'):
+        return b"".join(tts.stream())
+    
+    session = tts_session()
+    proxies = urllib.request.getproxies()
+    mp3_parts = []
+    for request in tts._prepare_requests():
+        try:
+            response = session.send(request, timeout=tts.timeout, proxies=proxies)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise gTTSError(tts=tts, response=response) from e
+        except requests.exceptions.RequestException as e:
+            raise gTTSError(tts=tts) from e
+        
+        for line in response.text.splitlines():
+            if "jQ1olc" not in line:
+                continue
+            match = TTS_AUDIO_PATTERN.search(line)
+            if not match:
+                # gTTS also treats an RPC line without audio as an error
+                raise gTTSError(tts=tts, response=response)
+            mp3_parts.append(base64.b64decode(match.group(1)))
+    
+    if not mp3_parts:
+        raise gTTSError(tts=tts, msg="No audio in Google TTS response")
+    return b"".join(mp3_parts)
+
+def cached_sentence(sentence, lang, tld, slow):
+    """Return a sentence's MP3 bytes from the fragment cache, synthesizing on a miss"""
+    fragment_path = FRAGMENT_CACHE_DIR / f"{tts_cache_key(sentence, lang, tld, slow)}.mp3"
+    if fragment_path.exists():
+        return fragment_path.read_bytes()
+    mp3_bytes = synthesize_sentence(sentence, lang, tld, slow)
+    write_cache_file(fragment_path, [mp3_bytes])
+    return mp3_bytes
+
+def synthesize_speech(text, lang, tld, slow):
+    """Synthesize text with Google TTS, one concurrent request per sentence
+    
+    The requests are network-latency bound, so overlapping them divides the
+    wall time. MP3 frames are self-contained, so the per-sentence results
+    can simply be concatenated in order. Sentences already in the fragment
+    cache are not requested again.
+    
+    Yields:
+        MP3 bytes for each sentence, in order, as soon as each is ready
+    """
+    sentences = split_sentences(text)
+    with ThreadPoolExecutor(max_workers=TTS_WORKERS) as executor:
+        yield from executor.map(lambda s: cached_sentence(s, lang, tld, slow), sentences)
+
+def cache_chunks(chunks, path):
+    """Pass chunks through unchanged, streaming a copy into a cache file
+    
+    Each chunk is written out as it passes, so the whole MP3 is never held
+    in memory. The cache file only appears once every chunk has been
+    consumed; an abandoned stream leaves nothing behind.
+    """
+    tmp_path = cache_tmp_path(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def read_chunks(path, chunk_size=64 * 1024):
+    """Yield a file's contents in fixed-size chunks"""
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+class ChunkReader(io.RawIOBase):
+    """Read-only, non-seekable file object over an iterable of byte chunks"""
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]  # A view, so the rest isn't copied
+        return size
+
+def convert_with_pyav(mp3_chunks, out_path, output_format='wav', sample_rate=SAMPLE_RATE):
+    """Transcode streamed MP3 chunks to a mono WAV or Opus file in-process with PyAV
+    
+    libavcodec decodes and libswresample converts to s16 mono at
+    sample_rate, with no subprocess, pipe or temp file. Chunks are pulled
+    as the demuxer needs them, so decoding starts with the first chunk.
+    """
+    import av
+    
+    encoder = ENCODERS[output_format]
+    with av.open(ChunkReader(mp3_chunks), format='mp3') as mp3_file, \
+            av.open(str(out_path), 'w', format=encoder['container']) as out_file:
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+        stream = out_file.add_stream(encoder['codec'], rate=sample_rate, layout='mono')
+        if encoder['bit_rate']:
+            stream.bit_rate = encoder['bit_rate']
+        stream.codec_context.options = encoder['options']
+        for packet in mp3_file.demux(audio=0):
+            try:
+                frames = packet.decode()
+            except av.InvalidDataError:
+                continue  # Skip junk between concatenated parts, as ffmpeg does
+            for frame in frames:
+                for resampled in resampler.resample(frame):
+                    out_file.mux(stream.encode(resampled))
+        
+        # Flush the resampler and encoder
+        for resampled in resampler.resample(None):
+            out_file.mux(stream.encode(resampled))
+        out_file.mux(stream.encode(None))
+
+def convert_with_ffmpeg(mp3_chunks, out_path, output_format='wav', sample_rate=SAMPLE_RATE):
+    """Transcode streamed MP3 chunks to a mono WAV or Opus file with one ffmpeg process
+    
+    Each chunk is written to ffmpeg's stdin as it arrives, so ffmpeg decodes
+    while later chunks are still being synthesized and nothing is decoded
+    or re-serialized in Python.
+    """
+    process = subprocess.Popen(
+        ["ffmpeg", "-loglevel", "error", "-y", "-i", "pipe:0",
+         "-ar", str(sample_rate), "-ac", "1", *ENCODERS[output_format]['ffmpeg_args'],
+         str(out_path)],
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    try:
+        for chunk in mp3_chunks:
+            process.stdin.write(chunk)
+    except BrokenPipeError:
+        pass  # ffmpeg exited early; its stderr explains why
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = process.stderr.read()
+        process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+def convert_mp3(mp3_chunks, out_path, output_format='wav', sample_rate=SAMPLE_RATE):
+    """Transcode an iterable of MP3 chunks to a mono file in an ENCODERS format
+    
+    Uses PyAV's in-process libav bindings when installed, otherwise an
+    ffmpeg subprocess.
+    """
+    if PYAV_AVAILABLE:
+        convert_with_pyav(mp3_chunks, out_path, output_format, sample_rate)
+    else:
+        convert_with_ffmpeg(mp3_chunks, out_path, output_format, sample_rate)
+
+def generate_speech(output_path=None, output_format='wav', sample_rate=SAMPLE_RATE):
+    """Generate speech from script and save as WAV, Opus or MP3 file.
+    
+    The synthesized MP3 and converted output are cached under CACHE_DIR, so
+    rerunning with an unchanged script skips Google TTS (and conversion).
+    MP3 output is written exactly as Google TTS returns it, with no
+    decode/re-encode step.
     
     Args:
-        output_path: Path to output WAV file. If None, saves to public directory.
+        output_path: Path to output file. If None, saves to public directory.
+        output_format: 'wav', 'opus' or 'mp3'
+        sample_rate: WAV sample rate in Hz (Opus always uses OPUS_SAMPLE_RATE)
     
     Returns:
-        Path to generated WAV file
+        Path to generated audio file
     """
     try:
-        print("Generating speech with Google TTS...")
-        
-        # Use UK English for a warmer tone
-        tts = gTTS(text=script, lang='en', tld='co.uk', slow=False)
-        
-        # Save to MP3 first (gTTS outputs MP3)
-        mp3_buffer = io.BytesIO()
-        tts.write_to_fp(mp3_buffer)
-        mp3_buffer.seek(0)
-        
-        print("Converting to WAV...")
-        
-        # Convert MP3 to WAV using pydub
-        audio = AudioSegment.from_mp3(mp3_buffer)
-        
         # Determine output path
         if output_path is None:
             # Save to public directory
             script_dir = os.path.dirname(os.path.abspath(__file__))
             project_root = os.path.dirname(script_dir)  # Go up from scripts/ to project root
             public_dir = os.path.join(project_root, "public")
-            wav_path = os.path.join(public_dir, "fire-horse-speech.wav")
+            speech_path = os.path.join(public_dir, f"fire-horse-speech.{output_format}")
         else:
-            wav_path = output_path
+            speech_path = output_path
+        
+        script = SCRIPT_PATH.read_text(encoding="utf-8").strip()
         
-        # Export as WAV (44.1kHz, 16-bit)
-        audio.export(wav_path, format="wav")
+        lang, tld, slow = TTS_LANG, TTS_TLD, TTS_SLOW
+        key = tts_cache_key(script, lang, tld, slow)
+        mp3_cache_path = CACHE_DIR / f"{key}.mp3"
+        if output_format == 'opus':
+            sample_rate = OPUS_SAMPLE_RATE
+        converted_cache_path = CACHE_DIR / f"{key}-{sample_rate}.{output_format}"
+        
+        if output_format == 'mp3':
+            if mp3_cache_path.exists():
+                print("Using cached Google TTS audio...")
+                shutil.copyfile(mp3_cache_path, speech_path)
+            else:
+                print("Generating speech with Google TTS...")
+                
+                # Write to a temp file so a failed synthesis leaves the previous output intact
+                tmp_path = cache_tmp_path(Path(speech_path))
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        f.writelines(cache_chunks(synthesize_speech(script, lang, tld, slow), mp3_cache_path))
+                    os.replace(tmp_path, speech_path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+        elif converted_cache_path.exists():
+            print("Using cached speech...")
+            shutil.copyfile(converted_cache_path, speech_path)
+        else:
+            if mp3_cache_path.exists():
+                print("Using cached Google TTS audio...")
+                mp3_chunks = read_chunks(mp3_cache_path)
+            else:
+                print(f"Generating speech with Google TTS and converting to {output_format.upper()}...")
+                
+                # gTTS outputs MP3; stream each sentence into the converter (and
+                # the cache) as it arrives, dropping it once both have it
+                mp3_chunks = cache_chunks(synthesize_speech(script, lang, tld, slow), mp3_cache_path)
+            
+            # Convert MP3 to WAV (16-bit, mono) or Opus (32 kbps, mono) in a
+            # temp file, so a failed synthesis leaves the previous output intact
+            tmp_path = cache_tmp_path(Path(speech_path))
+            try:
+                convert_mp3(mp3_chunks, tmp_path, output_format, sample_rate)
+                os.replace(tmp_path, speech_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            copy_cache_file(speech_path, converted_cache_path)
         
-        print(f"Speech saved to {wav_path}")
+        print(f"Speech saved to {speech_path}")
         
         # Get duration
-        duration = len(audio) / 1000.0
-        print(f"Duration: {duration:.1f} seconds")
+        if output_format == 'wav':
+            duration = wav_duration(speech_path)
+            print(f"Duration: {duration:.1f} seconds")
         
-        return wav_path
+        return speech_path
     
     except Exception as e:
         print(f"Error generating speech: {e}", file=sys.stderr)
-        print("\nNote: pydub requires ffmpeg to convert MP3 to WAV.")
+        print("\nNote: ffmpeg (or PyAV: pip install av) is required to convert MP3 to WAV or Opus.")
         print("Install ffmpeg with:")
         print("  macOS: brew install ffmpeg")
         print("  Linux: sudo apt-get install ffmpeg")
@@ -214,15 +532,16 @@ if __name__ == "__main__":
     parser.add_argument('--list-mics', action='store_true', 
                        help='List all available microphone devices')
     parser.add_argument('--output', '-o', type=str, default=None,
-                       help='Output WAV file path (default: public/fire-horse-speech.wav)')
+                       help='Output file path (default: public/fire-horse-speech.<format>)')
+    parser.add_argument('--format', '-f', choices=['wav', 'opus', 'mp3'], default='wav',
+                       help='Output format; opus (32 kbps) is several times smaller than wav, mp3 skips '
+                            'conversion entirely (default: wav)')
+    parser.add_argument('--sample-rate', '-r', type=int, default=SAMPLE_RATE,
+                       help=f'WAV sample rate in Hz (default: {SAMPLE_RATE})')
     args = parser.parse_args()
     
     if args.list_mics:
         display_microphones()
     else:
-        # Display microphones for reference
-        mics = display_microphones()
-        if mics:
-            print("Generating speech...")
-        print()
-        generate_speech(output_path=args.output)
\ No newline at end of file
+        generate_speech(output_path=args.output, output_format=args.format,
+                        sample_rate=args.sample_rate)
\ No newline at end of file